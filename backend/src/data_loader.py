@@ -4,6 +4,7 @@ from pathlib import Path
 from typing import Optional
 
 import pandas as pd
+import pyarrow as pa
 
 
 DATA_DIR = Path(__file__).resolve().parent.parent / "data"
@@ -20,16 +21,23 @@ def load_raw_dataset(filename: str) -> pd.DataFrame:
 
 
 def save_processed_dataset(df: pd.DataFrame, filename: str) -> Path:
-	"""Persist a processed dataset to the processed directory."""
+	"""Persist a processed dataset as uncompressed Feather (Arrow IPC) to the processed directory."""
 	PROCESSED_DIR.mkdir(parents=True, exist_ok=True)
 	path = PROCESSED_DIR / filename
-	df.to_csv(path, index=False)
+	# Uncompressed so readers can map the file instead of decoding it.
+	df.reset_index(drop=True).to_feather(path, compression="uncompressed")
 	return path
 
 
 def load_processed_dataset(filename: str) -> Optional[pd.DataFrame]:
-	"""Load a processed dataset if it exists, otherwise return None."""
+	"""Memory-map a processed Feather dataset if it exists, otherwise return None.
+
+	The columns are read-only views of the mapped file; copy before modifying them.
+	"""
 	path = PROCESSED_DIR / filename
 	if not path.exists():
 		return None
-	return pd.read_csv(path)
+	with pa.memory_map(str(path), "r") as source:
+		# split_blocks keeps one block per column, so pandas wraps the mapped
+		# buffers instead of consolidating them into private memory.
+		return pa.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
@@ -2,44 +2,65 @@
 
 from __future__ import annotations
 
+import json
+import os
 from pathlib import Path
 from typing import Tuple
 
-import joblib
+import numpy as np
 import pandas as pd
 from sklearn.metrics import classification_report
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 from xgboost import XGBClassifier
 
 from .data_loader import load_processed_dataset, save_processed_dataset
 from .preprocess import split_features_labels
 
 MODELS_DIR = Path(__file__).resolve().parent.parent / "models"
-MODEL_PATH = MODELS_DIR / "earthquake_model.joblib"
+MODEL_PATH = MODELS_DIR / "model.json"
+SCALER_PATH = MODELS_DIR / "scaler.npz"
+META_PATH = MODELS_DIR / "meta.json"
 
 
-def train_model(dataset_name: str, target_column: str, test_size: float = 0.2) -> Tuple[XGBClassifier, dict]:
+def _stratified_split(y: np.ndarray, test_size: float, seed: int) -> Tuple[np.ndarray, np.ndarray]:
+	"""Return shuffled train and test row indices, holding out ``test_size`` of each class."""
+	if not 0 < test_size < 1:
+		# Unlike train_test_split, integer row counts are not accepted.
+		raise ValueError(f"test_size must be a fraction between 0 and 1, got {test_size!r}")
+	rng = np.random.default_rng(seed)
+	test_mask = np.zeros(y.size, dtype=bool)
+	for label in np.unique(y):
+		members = rng.permutation(np.flatnonzero(y == label))
+		n_test = round(test_size * members.size)
+		if not 0 < n_test < members.size:
+			raise ValueError(
+				f"test_size={test_size} leaves class {label!r} ({members.size} rows) without a train or test row"
+			)
+		test_mask[members[:n_test]] = True
+	return rng.permutation(np.flatnonzero(~test_mask)), np.flatnonzero(test_mask)
+
+
+def train_model(
+	dataset_name: str,
+	target_column: str,
+	test_size: float = 0.2,
+	device: str | None = None,
+) -> Tuple[XGBClassifier, dict]:
 	df = load_processed_dataset(dataset_name)
 	if df is None:
 		raise FileNotFoundError("Processed dataset not found. Run preprocessing first.")
 
 	X, y = split_features_labels(df, target_column)
-	X_train, X_test, y_train, y_test = train_test_split(
-		X,
-		y,
-		test_size=test_size,
-		stratify=y,
-		random_state=42,
-	)
-
-	scaler = StandardScaler()
-	X_train_scaled = scaler.fit_transform(X_train)
-	X_test_scaled = scaler.transform(X_test)
+	# Convert once to float32 (XGBoost's internal dtype) and split by row index.
+	features = X.to_numpy(dtype=np.float32)
+	labels = y.to_numpy()
+	train_idx, test_idx = _stratified_split(labels, test_size, seed=42)
 
 	model = XGBClassifier(
 		objective="binary:logistic",
 		eval_metric="logloss",
+		tree_method="hist",
+		max_bin=256,
+		device=device or os.environ.get("XGB_DEVICE", "cpu"),
 		max_depth=6,
 		learning_rate=0.05,
 		n_estimators=300,
@@ -48,18 +69,21 @@ def train_model(dataset_name: str, target_column: str, test_size: float = 0.2) -
 		random_state=42,
 		use_label_encoder=False,
 	)
-	model.fit(X_train_scaled, y_train, verbose=False)
+	# Tree splits are invariant to monotonic rescaling, so the raw features are used as-is.
+	model.fit(features[train_idx], labels[train_idx], verbose=False)
 
-	y_pred = model.predict(X_test_scaled)
-	report = classification_report(y_test, y_pred, output_dict=True)
+	y_pred = model.predict(features[test_idx])
+	report = classification_report(labels[test_idx], y_pred, output_dict=True)
 
 	MODELS_DIR.mkdir(parents=True, exist_ok=True)
-	artifacts = {
-		"model": model,
-		"scaler": scaler,
-		"feature_names": X.columns.tolist(),
-	}
-	joblib.dump(artifacts, MODEL_PATH)
+	booster = model.get_booster()
+	booster.feature_names = X.columns.tolist()
+	booster.save_model(MODEL_PATH)
+	# Identity scaler state keeps older consumers of scaler.npz working.
+	n_features = X.shape[1]
+	np.savez(SCALER_PATH, mean=np.zeros(n_features), scale=np.ones(n_features))
+	with open(META_PATH, "w") as fh:
+		json.dump({"feature_names": X.columns.tolist()}, fh)
 
 	return model, report
 
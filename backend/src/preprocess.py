@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Tuple
 
+import bottleneck as bn
 import numpy as np
 import pandas as pd
 from sklearn.base import BaseEstimator, TransformerMixin
@@ -19,23 +20,101 @@ class PreprocessedData:
 	feature_columns: list[str]
 
 
+def _window_mean(values: np.ndarray, left: np.ndarray, right: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+	"""NaN-skipping means of ``values[left:right]`` per window, plus the non-NaN counts."""
+	valid = ~np.isnan(values)
+	sums = np.concatenate(([0.0], np.cumsum(np.where(valid, values, 0.0))))
+	counts = np.concatenate(([0], np.cumsum(valid)))
+	count = counts[right] - counts[left]
+	with np.errstate(divide="ignore", invalid="ignore"):
+		mean = (sums[right] - sums[left]) / count
+	return mean, count
+
+
+def _rolling_seismic(
+	ts_ns: np.ndarray,
+	mag: np.ndarray,
+	depth: np.ndarray,
+	window_ns: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+	"""Means and event counts over the trailing ``(ts - window, ts]`` of time-sorted events."""
+	left = np.searchsorted(ts_ns, ts_ns - window_ns, side="right")
+	right = np.arange(1, ts_ns.size + 1)
+	mag_mean, event_count = _window_mean(mag, left, right)
+	depth_mean, _ = _window_mean(depth, left, right)
+	return mag_mean, depth_mean, event_count
+
+
+def _rolling_seismic_events(
+	mag: np.ndarray,
+	depth: np.ndarray,
+	window_events: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+	"""Means and event counts over the trailing ``window_events`` time-sorted events."""
+	if window_events < 1:
+		raise ValueError(f"window_events must be at least 1, got {window_events!r}")
+	if mag.size == 0:
+		return np.empty(0), np.empty(0), np.empty(0, dtype=np.int64)
+	# bottleneck rejects windows longer than the series; with min_count=1 they are equivalent.
+	window = min(window_events, mag.size)
+	mag_mean = bn.move_mean(mag, window=window, min_count=1)
+	depth_mean = bn.move_mean(depth, window=window, min_count=1)
+	valid = (~np.isnan(mag)).astype(np.float64)
+	event_count = bn.move_sum(valid, window=window, min_count=1).astype(np.int64)
+	return mag_mean, depth_mean, event_count
+
+
+def _backfill(values: np.ndarray) -> np.ndarray:
+	"""Fill NaNs in place with the next valid value, leaving trailing NaNs untouched."""
+	missing = np.isnan(values)
+	if not missing.any():
+		return values
+	first_valid = int(np.argmax(~missing))
+	values[:first_valid] = values[first_valid]
+	if missing[first_valid:].any():
+		# Index of the next valid value at or after each position (n when none is left).
+		n = values.size
+		next_valid = np.minimum.accumulate(np.where(missing, n, np.arange(n))[::-1])[::-1]
+		fill = missing & (next_valid < n)
+		values[fill] = values[next_valid[fill]]
+	return values
+
+
 class SeismicFeatureEngineer(TransformerMixin, BaseEstimator):
-	"""Generate rolling-window seismic features."""
+	"""Generate rolling-window seismic features.
+
+	Windows span the trailing ``window_hours`` by default, or the trailing
+	``window_events`` events when that is set.
+	"""
 
-	def __init__(self, window_hours: int = 24) -> None:
+	def __init__(self, window_hours: int = 24, window_events: int | None = None) -> None:
 		self.window_hours = window_hours
+		self.window_events = window_events
 
 	def fit(self, X: pd.DataFrame, y: pd.Series | None = None) -> "SeismicFeatureEngineer":
 		return self
 
 	def transform(self, X: pd.DataFrame) -> pd.DataFrame:
-		df = X.copy()
-		rolling = df.sort_values("timestamp").rolling(f"{self.window_hours}H", on="timestamp")
-		df["mag_mean"] = rolling["magnitude"].mean()
-		df["depth_mean"] = rolling["depth"].mean()
-		df["event_count"] = rolling["magnitude"].count()
-		df.fillna(method="bfill", inplace=True)
-		return df.drop(columns=["timestamp"])
+		ts = X["timestamp"].values.view("i8")
+		order = np.argsort(ts, kind="stable")
+		mag = X["magnitude"].to_numpy(dtype=np.float64)[order]
+		depth = X["depth"].to_numpy(dtype=np.float64)[order]
+		if self.window_events is None:
+			window_ns = pd.Timedelta(hours=self.window_hours).value
+			mag_mean, depth_mean, event_count = _rolling_seismic(ts[order], mag, depth, window_ns)
+		else:
+			mag_mean, depth_mean, event_count = _rolling_seismic_events(mag, depth, self.window_events)
+		_backfill(mag_mean)
+		_backfill(depth_mean)
+		# The windows run in time order; map their outputs back onto the original rows.
+		inverse = np.empty_like(order)
+		inverse[order] = np.arange(order.size)
+		# Copy the pass-through columns so the output never aliases the caller's frame.
+		columns = {name: X[name].copy() for name in X.columns if name != "timestamp"}
+		columns["mag_mean"] = mag_mean[inverse]
+		columns["depth_mean"] = depth_mean[inverse]
+		columns["event_count"] = event_count[inverse]
+		return pd.DataFrame(columns, index=X.index, copy=False)
 
 
 def build_preprocessing_pipeline() -> Pipeline:
@@ -13,7 +13,7 @@ if str(BACKEND_DIR) not in sys.path:
 
 from src.model_train import train_model
 
-DEFAULT_DATASET = "earthquake_processed.csv"
+DEFAULT_DATASET = "earthquake_processed.feather"
 DEFAULT_TARGET = "alert_binary"
 
 
@@ -35,6 +35,11 @@ def parse_args() -> argparse.Namespace:
         default=0.2,
         help="Test set proportion (0 < value < 1)",
     )
+    parser.add_argument(
+        "--device",
+        default=None,
+        help="XGBoost training device, e.g. cpu or cuda (defaults to $XGB_DEVICE, then cpu)",
+    )
     return parser.parse_args()
 
 
@@ -42,9 +47,14 @@ if __name__ == "__main__":
     args = parse_args()
     dataset_path = BACKEND_DIR / "data" / "processed" / args.dataset
     if not dataset_path.exists():
-        raise FileNotFoundError(f"Dataset not found at {dataset_path}. Ensure the processed CSV is present.")
+        raise FileNotFoundError(f"Dataset not found at {dataset_path}. Ensure the processed Feather file is present.")
 
-    model, report = train_model(dataset_name=args.dataset, target_column=args.target, test_size=args.test_size)
+    model, report = train_model(
+        dataset_name=args.dataset,
+        target_column=args.target,
+        test_size=args.test_size,
+        device=args.device,
+    )
     precision = report["weighted avg"]["precision"]
     recall = report["weighted avg"]["recall"]
     f1 = report["weighted avg"]["f1-score"]